@@ -3,129 +3,621 @@ Zillow Wholesale Property Automation
 Main scraping and analysis engine
 """
 
-from selenium import webdriver
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.chrome.options import Options
-import pandas as pd
-import time
-import json
-from datetime import datetime
+import httpx
+import orjson
+import asyncio
+import atexit
+import csv
+import gzip
+import io
+import itertools
+import os
+import queue
+import re
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urljoin
+
+import lxml.html
+from lxml.etree import XPath
+
+from config import SELENIUM_REMOTE_URL, USER_AGENT
+
+ZILLOW_BASE_URL = "https://www.zillow.com"
+SEARCH_API_URL = f"{ZILLOW_BASE_URL}/async-create-search-page-state"
+
+# Shared by the sync and async HTTP clients
+CLIENT_OPTIONS = {
+    'http2': True,
+    'headers': {'User-Agent': USER_AGENT},
+    'follow_redirects': True,
+    'timeout': 10.0
+}
+
+# Property card queries for the browser fallback, built once
+# "css selector" is By.CSS_SELECTOR, spelled out so selenium is only imported on fallback
+CARD_LOCATOR = ("css selector", "[data-test='property-card']")
+CAPTCHA_LOCATOR = ("css selector", "#px-captcha")
+CAPTCHA_XPATH = XPath("//*[@id='px-captcha']")
+CARD_XPATH = XPath("//*[@data-test='property-card']")
+ADDRESS_XPATH = XPath("normalize-space(.//*[@data-test='property-card-addr'])")
+PRICE_XPATH = XPath("normalize-space(.//*[@data-test='property-card-price'])")
+DETAILS_XPATH = XPath(".//*[@data-test='property-card-details']//span")
+DOM_XPATH = XPath("normalize-space(.//*[contains(text(), 'days on Zillow')])")
+LINK_XPATH = XPath("string((.//a)[1]/@href)")
+
+# Unit suffixes and thousands separators in "3 bd", "2 ba", "1,450 sqft"
+_DETAIL_UNITS = re.compile(r' bd| ba| sqft|,')
+
+_ZPID = re.compile(r'/(\d+)_zpid/')
+
+# Recommended actions, strongest opportunity first (interned, shared by every property)
+_ACTIONS = tuple(map(sys.intern, (
+    "CALL TODAY - Strong opportunity",
+    "CALL THIS WEEK - Good potential",
+    "RESEARCH MORE - Gather intel"
+)))
+
+# Days-on-market scoring: (more than N days, points), longest first
+_DOM_POINTS = ((120, 40), (90, 30), (60, 20))
+_UNKNOWN_DOM_POINTS = 10  # Unknown DOM gets some points
+
+# Minimum score for each _ACTIONS bucket except the last
+_ACTION_THRESHOLDS = (70, 50)
+
+# Batch sizes where vectorized scoring beats the scalar scorer, counting the
+# numpy/pandas import, and once pandas is already imported
+VECTORIZE_MIN_ROWS = 1_000_000
+VECTORIZE_MIN_ROWS_LOADED = 10_000
+
+DRIVER_POOL_SIZE = 4  # Warm Chrome sessions kept between searches
+CHROME_DISK_CACHE_SIZE = 256 * 1024 * 1024  # 256 MiB
+
+WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB, so exports hit the kernel in large batches
+
+SEARCH_WANTS = orjson.dumps({'cat1': ['mapResults']}).decode()
+
+def _search_state(location, min_price, max_price, single_family):
+    """Build Zillow searchQueryState payload"""
+    search_state = {
+        'pagination': {},
+        'usersSearchTerm': location,
+        'mapBounds': {},
+        'isMapVisible': True,
+        'filterState': {
+            'sortSelection': {'value': 'days'},  # Sort by days on market
+            'daysOnZillow': {'min': 30},  # 30+ days minimum
+            'price': {
+                'min': min_price,
+                'max': max_price
+            }
+        }
+    }
+    
+    # Add property type filters
+    if single_family:
+        search_state['filterState']['homeType'] = {'in': [6]}  # Single family
+    
+    return search_state
+
+@lru_cache(maxsize=128)
+def _encoded_search_state(location, min_price, max_price, single_family):
+    """JSON-encode searchQueryState once per distinct search"""
+    return orjson.dumps(_search_state(location, min_price, max_price, single_family)).decode()
+
+def _field(result, key, default="N/A"):
+    """Read a search API field as text, falling back when missing"""
+    value = result.get(key)
+    return default if value is None else str(value)
+
+def _open_text_writer(filename, compress=False):
+    """Open a text file for writing behind a large write buffer"""
+    if compress:
+        # Level 1 keeps compression from outpacing the disk writes it saves
+        raw = gzip.open(filename, 'wb', compresslevel=1)
+        buffered = io.BufferedWriter(raw, buffer_size=WRITE_BUFFER_SIZE)
+        return io.TextIOWrapper(buffered, encoding='utf-8', newline='')
+    return open(filename, 'w', encoding='utf-8', newline='', buffering=WRITE_BUFFER_SIZE)
+
+def _dom_score(dom):
+    """Score one parsed days-on-market value (NaN when unknown)"""
+    if dom != dom:  # NaN
+        return _UNKNOWN_DOM_POINTS
+    for days, points in _DOM_POINTS:
+        if dom > days:
+            return points
+    return 0
+
+def _action_bucket(score):
+    """Index into _ACTIONS for a deal score"""
+    for bucket, threshold in enumerate(_ACTION_THRESHOLDS):
+        if score >= threshold:
+            return bucket
+    return len(_ACTION_THRESHOLDS)
+
+def _analysis(property_data, score, bucket):
+    """Analysis fields merged into a scored property"""
+    return {
+        'opportunity_score': score,
+        'recommended_action': _ACTIONS[bucket],
+        'analysis_notes': f"DOM: {property_data['days_on_market']} days"
+    }
+
+def _fieldnames(rows):
+    """Column names across all rows, in first-seen order"""
+    return list(dict.fromkeys(key for row in rows for key in row))
+
+def _arrow_table(rows):
+    """Build a pyarrow Table from property dicts with differing keys"""
+    import pyarrow as pa
+    
+    return pa.Table.from_pydict({
+        key: [row.get(key) for row in rows]
+        for key in _fieldnames(rows)
+    })
+
+def _zpid_from_url(url):
+    """Zillow property id from a /homedetails/..._zpid/ URL"""
+    match = _ZPID.search(url or '')
+    return match.group(1) if match else None
+
+def _result_zpid(result):
+    """Zillow property id of a search API result"""
+    if result.get('zpid'):
+        return str(result['zpid'])
+    return _zpid_from_url(result.get('detailUrl'))
 
 class ZillowWholesaleScraper:
+    # Warm Chrome sessions reused by every search in this process, one pool per
+    # remote_url (None for local Chrome) so Grid and local drivers never mix.
+    # Each pool also caps checked-out drivers at DRIVER_POOL_SIZE.
+    _driver_pools = {}
+    _driver_pools_lock = threading.Lock()
+    # Numbers each local driver's disk cache directory
+    _driver_ids = itertools.count()
+    
     def __init__(self, config):
         self.config = config
+        self.remote_url = config.get('remote_url', SELENIUM_REMOTE_URL)
+        self.http_cache_dir = Path(config.get('http_cache_dir', '.zcache'))
+        self.http_cache_ttl = config.get('http_cache_ttl', 600)  # Seconds
+        self.client = None
         self.driver = None
         self.properties = []
+        self.cache_path = config.get('cache_path', 'cache.feather')
+        # Listings age into stronger DOM buckets, so cached rows must be re-scraped eventually
+        self.cache_ttl = timedelta(hours=config.get('cache_ttl_hours', 24))
+        self.cache = self.load_cache()
+        
+    def _create_client(self):
+        """Create an HTTP/2 client carrying Zillow's session cookies"""
+        import hishel  # Deferred, it adds noticeably to module import time
+        
+        # Repeat searches within the TTL are answered from disk when Zillow's headers allow it
+        storage = hishel.FileStorage(base_path=self.http_cache_dir, ttl=self.http_cache_ttl)
+        client = hishel.CacheClient(storage=storage, **CLIENT_OPTIONS)
+        
+        # Pick up Zillow's session cookies before calling the API
+        try:
+            client.get(f"{ZILLOW_BASE_URL}/")
+        except Exception:
+            client.close()
+            raise
+        return client
+    
+    def setup_client(self):
+        """Initialize HTTP/2 client for Zillow's search API"""
+        self.client = self._create_client()
+        return self.client
+    
+    @classmethod
+    def _create_driver(cls, remote_url=None, cache_dir=None):
+        """Start Chrome locally, or on a Selenium Grid hub when given"""
+        # Deferred so API-only runs never pay selenium's import cost
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
         
-    def setup_driver(self):
-        """Initialize Chrome driver with stealth settings"""
         chrome_options = Options()
         chrome_options.add_argument('--no-sandbox')
         chrome_options.add_argument('--disable-dev-shm-usage')
         chrome_options.add_argument('--disable-blink-features=AutomationControlled')
         chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
         
-        self.driver = webdriver.Chrome(options=chrome_options)
-        return self.driver
+        # Only card text is scraped, so skip rendering images and return at DOMContentLoaded
+        chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--blink-settings=imagesEnabled=false')
+        chrome_options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        chrome_options.page_load_strategy = 'eager'
+        
+        if remote_url:
+            return webdriver.Remote(command_executor=remote_url, options=chrome_options)
+        
+        # Keep Chrome's HTTP cache on disk for the driver's pooled lifetime. Chrome's disk
+        # cache can't be shared between processes, so each driver in each process gets
+        # its own directory, removed again when the driver quits.
+        driver_cache_dir = None
+        if cache_dir:
+            driver_cache_dir = (
+                Path(cache_dir).resolve() / f'driver-{os.getpid()}-{next(cls._driver_ids)}'
+            )
+            chrome_options.add_argument(f'--disk-cache-dir={driver_cache_dir}')
+            chrome_options.add_argument(f'--disk-cache-size={CHROME_DISK_CACHE_SIZE}')
+        
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.zillow_cache_dir = driver_cache_dir
+        return driver
     
-    def build_search_url(self):
-        """Build Zillow search URL from user config"""
-        base_url = "https://www.zillow.com/homes/for_sale/"
+    @staticmethod
+    def _quit_driver(driver):
+        """Quit a driver and remove its private disk cache"""
+        try:
+            driver.quit()
+        finally:
+            cache_dir = getattr(driver, 'zillow_cache_dir', None)
+            if cache_dir:
+                shutil.rmtree(cache_dir, ignore_errors=True)
+    
+    @classmethod
+    def _driver_pool(cls, remote_url):
+        """Idle drivers and checkout slots for one Selenium target"""
+        with cls._driver_pools_lock:
+            if remote_url not in cls._driver_pools:
+                cls._driver_pools[remote_url] = (
+                    queue.Queue(maxsize=DRIVER_POOL_SIZE),
+                    threading.BoundedSemaphore(DRIVER_POOL_SIZE)
+                )
+            return cls._driver_pools[remote_url]
+    
+    @classmethod
+    def setup_driver(cls, remote_url=None, cache_dir=None):
+        """Check out a warm Chrome driver from the pool, starting one if empty"""
+        idle, slots = cls._driver_pool(remote_url)
         
-        # Location
+        # Blocks while DRIVER_POOL_SIZE drivers are checked out, bounding live Chrome sessions
+        slots.acquire()
+        try:
+            return idle.get_nowait()
+        except queue.Empty:
+            pass
+        
+        try:
+            return cls._create_driver(remote_url, cache_dir)
+        except Exception:
+            slots.release()
+            raise
+    
+    @classmethod
+    def release_driver(cls, driver, remote_url=None):
+        """Return a driver to its pool, quitting it if the pool is full"""
+        idle, slots = cls._driver_pool(remote_url)
+        try:
+            idle.put_nowait(driver)
+        except queue.Full:
+            cls._quit_driver(driver)
+        finally:
+            slots.release()
+    
+    @classmethod
+    def discard_driver(cls, driver, remote_url=None):
+        """Quit a possibly broken driver instead of returning it to the pool"""
+        _, slots = cls._driver_pool(remote_url)
+        try:
+            cls._quit_driver(driver)
+        finally:
+            slots.release()
+    
+    @classmethod
+    def close_drivers(cls):
+        """Quit every pooled driver (runs at interpreter exit)"""
+        with cls._driver_pools_lock:
+            pools = list(cls._driver_pools.values())
+        
+        for idle, _ in pools:
+            while True:
+                try:
+                    driver = idle.get_nowait()
+                except queue.Empty:
+                    break
+                cls._quit_driver(driver)
+    
+    def get_search_location(self):
+        """Resolve the Zillow search term from user config"""
         if self.config['location_type'] == 'county':
-            location = f"{self.config['county']}-{self.config['state']}"
-        else:
-            location = self.config['zip_code']
-        
-        # Build filter parameters
-        filters = {
-            'searchQueryState': {
-                'pagination': {},
-                'usersSearchTerm': location,
-                'mapBounds': {},
-                'isMapVisible': True,
-                'filterState': {
-                    'sortSelection': {'value': 'days'},  # Sort by days on market
-                    'daysOnZillow': {'min': 30},  # 30+ days minimum
-                    'price': {
-                        'min': self.config.get('min_price', 50000),
-                        'max': self.config.get('max_price', 300000)
-                    }
-                }
-            }
+            return f"{self.config['county']}-{self.config['state']}"
+        return self.config['zip_code']
+    
+    def _search_key(self, location=None):
+        """Hashable inputs that fully determine the search payload"""
+        return (
+            location or self.get_search_location(),
+            self.config.get('min_price', 50000),
+            self.config.get('max_price', 300000),
+            self.config['property_types']['single_family']
+        )
+    
+    def build_search_state(self, location=None):
+        """Build Zillow searchQueryState payload from user config"""
+        return _search_state(*self._search_key(location))
+    
+    def build_search_url(self, location=None):
+        """Build Zillow search URL from user config"""
+        base_url = f"{ZILLOW_BASE_URL}/homes/for_sale/"
+        return f"{base_url}{location or self.get_search_location()}/"
+    
+    @staticmethod
+    def is_captcha(response):
+        """Detect Zillow's anti-bot challenge in place of JSON results"""
+        if response.status_code == 403:
+            return True
+        content_type = response.headers.get('content-type', '')
+        return 'json' not in content_type and 'captcha' in response.text.lower()
+    
+    def build_search_params(self, location=None):
+        """Build search API query parameters for one location"""
+        return {
+            'searchQueryState': _encoded_search_state(*self._search_key(location)),
+            'wants': SEARCH_WANTS
         }
+    
+    def parse_search_response(self, response):
+        """Extract properties from a search API response, None if captcha'd"""
+        if self.is_captcha(response):
+            return None
         
-        # Add property type filters
-        if self.config['property_types']['single_family']:
-            filters['searchQueryState']['filterState']['homeType'] = {'in': [6]}  # Single family
+        if response.status_code != 200:
+            print(f"Search API failed with status {response.status_code}")
+            return []
         
-        return f"{base_url}{location}/"
+        # A non-JSON 200 is a block or maintenance page, handle it like a captcha
+        try:
+            payload = orjson.loads(response.content)
+        except orjson.JSONDecodeError:
+            return None
+        if not isinstance(payload, dict):
+            return None
+        
+        # Zillow sends null for empty sections, so don't trust .get() defaults
+        search_results = (payload.get('cat1') or {}).get('searchResults') or {}
+        results = search_results.get('mapResults') or []
+        if not results:
+            print("No properties found")
+            return []
+        
+        properties = []
+        for result in results[:self.config.get('max_results', 10)]:  # Limit results
+            # Reuse listings scraped on a recent run instead of re-extracting them
+            property_data = self.cached_property_data(_result_zpid(result))
+            if not property_data:
+                property_data = self.extract_property_data(result)
+            if property_data:
+                properties.append(property_data)
+        
+        return properties
+    
+    def fetch_search_results(self, client, location=None):
+        """Query the search API for one location, None if captcha'd"""
+        response = client.get(
+            SEARCH_API_URL,
+            params=self.build_search_params(location),
+            headers={'Accept': 'application/json'}
+        )
+        return self.parse_search_response(response)
     
     def search_properties(self):
-        """Execute the property search"""
-        if not self.driver:
-            self.setup_driver()
+        """Execute the property search against Zillow's JSON API"""
+        if not self.client:
+            self.setup_client()
         
-        search_url = self.build_search_url()
-        print(f"Searching: {search_url}")
+        print(f"Searching: {self.get_search_location()}")
+        properties = self.fetch_search_results(self.client)
         
-        self.driver.get(search_url)
-        time.sleep(3)  # Let page load
+        # Only pay for a browser when Zillow refuses the API call
+        if properties is None:
+            print("Captcha returned by search API, falling back to browser")
+            return self.search_properties_browser()
         
-        # Wait for property cards to load
+        self.properties.extend(properties)
+        return self.properties
+    
+    def _fetch_location(self, location):
+        """Search one location on a dedicated client (worker thread)"""
+        # The client is already open (cookie priming), so close it rather than re-enter it
+        client = self._create_client()
         try:
-            WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "[data-test='property-card']"))
+            properties = self.fetch_search_results(client, location)
+        finally:
+            client.close()
+        
+        if properties is None:
+            print(f"Captcha returned for {location}, falling back to browser")
+            properties = self._scrape_with_pooled_driver(location)
+        
+        return properties
+    
+    def search_properties_many(self, locations):
+        """Search several counties/ZIPs concurrently"""
+        max_workers = self.config.get('max_workers', 8)
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self._fetch_location, loc): loc for loc in locations}
+            for future in as_completed(futures):
+                try:
+                    self.properties.extend(future.result())
+                except Exception as e:
+                    print(f"Error searching {futures[future]}: {e}")
+        
+        return self.properties
+    
+    async def _afetch(self, client, location):
+        """Query the search API for one location on the shared async client"""
+        response = await client.get(
+            SEARCH_API_URL,
+            params=self.build_search_params(location),
+            headers={'Accept': 'application/json'}
+        )
+        properties = self.parse_search_response(response)
+        
+        if properties is None:
+            print(f"Captcha returned for {location}, falling back to browser")
+            properties = await asyncio.to_thread(self._scrape_with_pooled_driver, location)
+        
+        return properties
+    
+    async def search_properties_async(self, locations):
+        """Search many counties/ZIPs concurrently from a single event loop"""
+        import hishel  # Deferred, it adds noticeably to module import time
+        
+        limits = httpx.Limits(max_connections=64)
+        storage = hishel.AsyncFileStorage(base_path=self.http_cache_dir, ttl=self.http_cache_ttl)
+        
+        async with hishel.AsyncCacheClient(storage=storage, limits=limits, **CLIENT_OPTIONS) as client:
+            # Pick up Zillow's session cookies before calling the API
+            await client.get(f"{ZILLOW_BASE_URL}/")
+            results = await asyncio.gather(
+                *[self._afetch(client, loc) for loc in locations],
+                return_exceptions=True
             )
+        
+        for location, properties in zip(locations, results):
+            if isinstance(properties, Exception):
+                print(f"Error searching {location}: {properties}")
+                continue
+            self.properties.extend(properties)
+        
+        return self.properties
+    
+    def _scrape_with_pooled_driver(self, location):
+        """Scrape one location on a pooled driver, then hand it back"""
+        driver = self.setup_driver(self.remote_url, self.http_cache_dir / 'chrome')
+        try:
+            properties = self.scrape_browser(driver, location)
+        except Exception:
+            self.discard_driver(driver, self.remote_url)  # Don't pool a possibly broken session
+            raise
+        
+        self.release_driver(driver, self.remote_url)
+        return properties
+    
+    def scrape_browser(self, driver, location=None):
+        """Scrape property cards for one location with a Chrome driver"""
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        search_url = self.build_search_url(location)
+        print(f"Searching: {search_url}")
+        
+        driver.get(search_url)
+        
+        # Wait only until cards render, or stop early on an anti-bot challenge
+        try:
+            WebDriverWait(driver, 8).until(EC.any_of(
+                EC.presence_of_element_located(CARD_LOCATOR),
+                EC.presence_of_element_located(CAPTCHA_LOCATOR)
+            ))
         except:
             print("No properties found or page didn't load properly")
             return []
         
-        # Extract property data
-        property_cards = self.driver.find_elements(By.CSS_SELECTOR, "[data-test='property-card']")
+        # Parse the rendered page once instead of querying each card over WebDriver
+        tree = lxml.html.fromstring(driver.page_source)
+        if CAPTCHA_XPATH(tree):
+            print("Captcha shown in browser, skipping search")
+            return []
+        property_cards = CARD_XPATH(tree)
         
+        properties = []
         for card in property_cards[:self.config.get('max_results', 10)]:  # Limit results
-            property_data = self.extract_property_data(card)
+            # Reuse listings scraped on a recent run instead of re-extracting them
+            property_data = self.cached_property_data(_zpid_from_url(LINK_XPATH(card)))
+            if not property_data:
+                property_data = self.extract_card_data(card)
             if property_data:
-                self.properties.append(property_data)
+                properties.append(property_data)
+        
+        return properties
+    
+    def search_properties_browser(self):
+        """Execute the property search in Chrome (captcha fallback)"""
+        if not self.driver:
+            self.driver = self.setup_driver(self.remote_url, self.http_cache_dir / 'chrome')
         
+        try:
+            properties = self.scrape_browser(self.driver)
+        except Exception:
+            self.discard_driver(self.driver, self.remote_url)  # Don't let cleanup pool a broken session
+            self.driver = None
+            raise
+        
+        self.properties.extend(properties)
         return self.properties
     
-    def extract_property_data(self, card):
-        """Extract data from individual property card"""
+    def extract_property_data(self, result):
+        """Extract data from individual search API result"""
+        try:
+            # Days on market lives on the listing or its home info
+            home_info = (result.get('hdpData') or {}).get('homeInfo') or {}
+            days_on_market = result.get('daysOnZillow')
+            if days_on_market is None:
+                days_on_market = home_info.get('daysOnZillow')
+            
+            return {
+                'address': result['address'],
+                'price': _field(result, 'price'),
+                'bedrooms': sys.intern(_field(result, 'beds')),
+                'bathrooms': sys.intern(_field(result, 'baths')),
+                'square_feet': _field(result, 'area'),
+                'days_on_market': "Unknown" if days_on_market is None else sys.intern(str(days_on_market)),
+                'url': urljoin(ZILLOW_BASE_URL, result['detailUrl']),
+                'zpid': _result_zpid(result),
+                'scraped_date': datetime.now().isoformat()
+            }
+            
+        except Exception as e:
+            print(f"Error extracting property data: {e}")
+            return None
+    
+    def extract_card_data(self, card):
+        """Extract data from individual property card (lxml element)"""
         try:
             # Basic property info
-            address = card.find_element(By.CSS_SELECTOR, "[data-test='property-card-addr']").text
-            price = card.find_element(By.CSS_SELECTOR, "[data-test='property-card-price']").text
+            address = ADDRESS_XPATH(card)
+            price = PRICE_XPATH(card)
+            if not address or not price:
+                raise ValueError("card is missing address or price")
             
             # Property details
-            details = card.find_elements(By.CSS_SELECTOR, "[data-test='property-card-details'] span")
+            details = DETAILS_XPATH(card)
             beds, baths, sqft = "N/A", "N/A", "N/A"
             
             if len(details) >= 3:
-                beds = details[0].text.replace(' bd', '')
-                baths = details[1].text.replace(' ba', '')
-                sqft = details[2].text.replace(' sqft', '').replace(',', '')
+                beds, baths, sqft = (
+                    _DETAIL_UNITS.sub('', span.text_content().strip()) for span in details[:3]
+                )
             
             # Days on market (if available)
-            dom_element = card.find_elements(By.XPATH, ".//*[contains(text(), 'days on Zillow')]")
-            days_on_market = dom_element[0].text.split()[0] if dom_element else "Unknown"
+            dom_text = DOM_XPATH(card)
+            days_on_market = dom_text.split()[0] if dom_text else "Unknown"
             
             # Property link for more details
-            link_element = card.find_element(By.CSS_SELECTOR, "a")
-            property_url = link_element.get_attribute('href')
+            href = LINK_XPATH(card)
+            if not href:
+                raise ValueError("card is missing a property link")
+            property_url = urljoin(ZILLOW_BASE_URL, href)
             
             return {
                 'address': address,
                 'price': price,
-                'bedrooms': beds,
-                'bathrooms': baths,
+                'bedrooms': sys.intern(beds),
+                'bathrooms': sys.intern(baths),
                 'square_feet': sqft,
-                'days_on_market': days_on_market,
+                'days_on_market': sys.intern(days_on_market),
                 'url': property_url,
+                'zpid': _zpid_from_url(property_url),
                 'scraped_date': datetime.now().isoformat()
             }
             
@@ -136,9 +628,22 @@ class ZillowWholesaleScraper:
     def analyze_deals(self):
         """Analyze each property for wholesale opportunity"""
         analyzed_properties = []
+        if not self.properties:
+            return analyzed_properties
+        
+        # numpy/pandas only pay off on large batches, mostly because importing them
+        # costs ~0.4s; typical runs (max_results per location) use the scalar scorer
+        rows = len(self.properties)
+        vectorize = rows >= VECTORIZE_MIN_ROWS or (
+            rows >= VECTORIZE_MIN_ROWS_LOADED and 'pandas' in sys.modules
+        )
+        
+        if vectorize:
+            analyses = self.score_properties(self.properties)
+        else:
+            analyses = map(self.calculate_opportunity_score, self.properties)
         
-        for prop in self.properties:
-            analysis = self.calculate_opportunity_score(prop)
+        for prop, analysis in zip(self.properties, analyses):
             prop.update(analysis)
             analyzed_properties.append(prop)
         
@@ -146,49 +651,154 @@ class ZillowWholesaleScraper:
     
     def calculate_opportunity_score(self, property_data):
         """Calculate deal score and recommended action"""
-        score = 0
-        
-        # Days on market scoring
         try:
-            dom = int(property_data['days_on_market'])
-            if dom > 120: score += 40
-            elif dom > 90: score += 30
-            elif dom > 60: score += 20
-        except:
-            score += 10  # Unknown DOM gets some points
+            dom = float(property_data['days_on_market'])
+        except (TypeError, ValueError):
+            dom = float('nan')
+        
+        score = _dom_score(dom)
+        return _analysis(property_data, score, _action_bucket(score))
+    
+    def score_properties(self, properties):
+        """Calculate deal scores and recommended actions for many properties"""
+        # Deferred so scraping/export-only runs never pay numpy/pandas import cost
+        import numpy as np
+        import pandas as pd
+        
+        # Unparseable DOM ("Unknown") becomes NaN instead of raising per row
+        dom = pd.to_numeric(
+            pd.Series([prop['days_on_market'] for prop in properties], dtype=object),
+            errors='coerce'
+        ).to_numpy(dtype=float)
+        
+        # Days on market scoring, unknown DOM gets some points
+        scores = np.select(
+            [dom > days for days, _ in _DOM_POINTS] + [np.isnan(dom)],
+            [points for _, points in _DOM_POINTS] + [_UNKNOWN_DOM_POINTS],
+            default=0
+        )
         
         # Add other scoring logic here based on your criteria
         
-        # Determine action
-        if score >= 70:
-            action = "CALL TODAY - Strong opportunity"
-        elif score >= 50:
-            action = "CALL THIS WEEK - Good potential"
-        else:
-            action = "RESEARCH MORE - Gather intel"
+        # Determine action bucket, indexing _ACTIONS keeps the interned labels
+        buckets = np.select(
+            [scores >= threshold for threshold in _ACTION_THRESHOLDS],
+            list(range(len(_ACTION_THRESHOLDS))),
+            default=len(_ACTION_THRESHOLDS)
+        )
         
-        return {
-            'opportunity_score': score,
-            'recommended_action': action,
-            'analysis_notes': f"DOM: {property_data['days_on_market']} days"
-        }
+        return [
+            _analysis(prop, score, bucket)
+            for prop, score, bucket in zip(properties, scores.tolist(), buckets.tolist())
+        ]
     
-    def export_call_sheets(self, filename='call_sheets.csv'):
-        """Export properties to CSV for call sheets"""
+    def export_call_sheets(self, filename='call_sheets.csv', compress=False):
+        """Export properties to CSV (optionally gzipped) for call sheets"""
         if not self.properties:
             print("No properties to export")
             return
         
-        df = pd.DataFrame(self.properties)
-        df.to_csv(filename, index=False)
+        if compress:
+            filename += '.gz'
+        
+        # Rows are already dicts, so stream them straight to disk
+        with _open_text_writer(filename, compress) as f:
+            # Fieldnames already cover every key, so skip DictWriter's per-row extras check
+            writer = csv.DictWriter(
+                f, fieldnames=_fieldnames(self.properties), extrasaction='ignore'
+            )
+            writer.writeheader()
+            writer.writerows(self.properties)
         print(f"Call sheets exported to {filename}")
         
         return filename
     
+    def export_feather(self, filename='call_sheets.feather'):
+        """Export properties to Feather (LZ4) for fast reloads"""
+        if not self.properties:
+            print("No properties to export")
+            return
+        
+        # Optional dependency, only needed for Feather files
+        import pyarrow.feather as feather
+        
+        feather.write_feather(_arrow_table(self.properties), filename, compression='lz4')
+        print(f"Properties exported to {filename}")
+        
+        return filename
+    
+    def load_cache(self):
+        """Load properties scraped within cache_ttl, keyed by zpid"""
+        if not os.path.exists(self.cache_path):
+            return {}
+        
+        # Optional dependency, only needed for Feather files
+        import pyarrow.feather as feather
+        
+        rows = feather.read_table(self.cache_path).to_pylist()
+        cutoff = (datetime.now() - self.cache_ttl).isoformat()
+        
+        # Expired rows are dropped here and left out when save_cache rewrites the file
+        return {
+            row['zpid']: row for row in rows
+            if row.get('scraped_date') and row['scraped_date'] >= cutoff
+        }
+    
+    def cached_property_data(self, zpid):
+        """Copy of a cached listing, or None if it wasn't scraped recently"""
+        cached = self.cache.get(zpid)
+        return dict(cached) if cached else None
+    
+    def save_cache(self):
+        """Merge this run's properties into the zpid cache on disk"""
+        cache = dict(self.cache)
+        cache.update((prop['zpid'], prop) for prop in self.properties if prop.get('zpid'))
+        if not cache:
+            return
+        
+        # Optional dependency, only needed for Feather files
+        import pyarrow.feather as feather
+        
+        feather.write_feather(
+            _arrow_table(list(cache.values())),
+            self.cache_path,
+            compression='zstd',
+            compression_level=3
+        )
+        self.cache = cache
+        print(f"Cached {len(cache)} properties in {self.cache_path}")
+        
+        return self.cache_path
+    
+    def save_raw(self, filename='properties.ndjson'):
+        """Save raw properties as NDJSON so a failed run can resume"""
+        if not self.properties:
+            print("No properties to save")
+            return
+        
+        with open(filename, 'wb', buffering=WRITE_BUFFER_SIZE) as f:
+            for prop in self.properties:
+                f.write(orjson.dumps(prop, option=orjson.OPT_APPEND_NEWLINE))
+        print(f"Raw properties saved to {filename}")
+        
+        return filename
+    
+    def load_raw(self, filename='properties.ndjson'):
+        """Reload properties saved by save_raw instead of re-scraping"""
+        with open(filename, 'rb') as f:
+            self.properties.extend(orjson.loads(line) for line in f if line.strip())
+        
+        return self.properties
+    
     def cleanup(self):
-        """Close browser and cleanup"""
+        """Close HTTP client, browser and cleanup"""
+        if self.client:
+            self.client.close()
         if self.driver:
-            self.driver.quit()
+            self.release_driver(self.driver, self.remote_url)
+            self.driver = None
+
+atexit.register(ZillowWholesaleScraper.close_drivers)
 
 # Example usage
 if __name__ == "__main__":
@@ -200,15 +810,17 @@ if __name__ == "__main__":
         'property_types': {'single_family': True},
         'max_results': 10,
         'min_price': 100000,
-        'max_price': 250000
+        'max_price': 250000,
+        'locations': ['Wake-NC', 'Durham-NC', 'Johnston-NC']
     }
     
     scraper = ZillowWholesaleScraper(config)
     
     try:
-        properties = scraper.search_properties()
+        properties = asyncio.run(scraper.search_properties_async(config['locations']))
         analyzed = scraper.analyze_deals()
         scraper.export_call_sheets()
+        scraper.save_cache()
         
         print(f"Found {len(properties)} properties")
         for prop in analyzed:
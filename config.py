@@ -4,10 +4,11 @@ Maps UI selections to scraper parameters
 """
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field, replace
+from functools import cached_property
 from typing import Dict, List, Optional
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PropertyConfig:
     """Property search configuration"""
     single_family: bool = True
@@ -17,13 +18,13 @@ class PropertyConfig:
     built_after_1990: bool = False
     built_after_2000: bool = False
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RentalStrategyConfig:
     """Rental strategy configuration"""
     market_rate: bool = True
     section_8: bool = False
 
-@dataclass
+@dataclass(frozen=True)  # No slots: cached_property needs __dict__
 class ManagementConfig:
     """Property management configuration"""
     property_managed: bool = True
@@ -31,7 +32,7 @@ class ManagementConfig:
     use_default_fee: bool = True
     custom_fee: Optional[float] = None
     
-    @property
+    @cached_property
     def management_fee_rate(self) -> float:
         """Calculate actual management fee rate"""
         if self.self_managed:
@@ -41,7 +42,7 @@ class ManagementConfig:
         else:
             return (self.custom_fee or 10.0) / 100.0
 
-@dataclass
+@dataclass(frozen=True)  # No slots: cached_property needs __dict__
 class LocationConfig:
     """Geographic search configuration"""
     input_method: str = "manual"  # "manual" or "import_data"
@@ -52,7 +53,7 @@ class LocationConfig:
     zip_code: str = ""
     custom_radius: Optional[int] = None
     
-    @property
+    @cached_property
     def search_radius(self) -> int:
         """Calculate search radius in miles"""
         if self.custom_radius:
@@ -62,7 +63,7 @@ class LocationConfig:
         else:
             return 5   # ZIP default
 
-@dataclass
+@dataclass(frozen=True)  # No slots: cached_property needs __dict__
 class InvestmentConfig:
     """Investment strategy configuration"""
     cash_purchase: bool = True
@@ -70,7 +71,7 @@ class InvestmentConfig:
     use_default_down: bool = True
     custom_down: Optional[float] = None
     
-    @property
+    @cached_property
     def down_payment_rate(self) -> float:
         """Calculate down payment percentage"""
         if self.cash_purchase:
@@ -80,7 +81,7 @@ class InvestmentConfig:
         else:
             return (self.custom_down or 20.0) / 100.0
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class SearchConfig:
     """Main search configuration class"""
     # Core settings
@@ -89,11 +90,11 @@ class SearchConfig:
     min_days_on_market: int = 30
     
     # Sub-configurations
-    property: PropertyConfig = PropertyConfig()
-    rental_strategy: RentalStrategyConfig = RentalStrategyConfig()
-    management: ManagementConfig = ManagementConfig()
-    location: LocationConfig = LocationConfig()
-    investment: InvestmentConfig = InvestmentConfig()
+    property: PropertyConfig = field(default_factory=PropertyConfig)
+    rental_strategy: RentalStrategyConfig = field(default_factory=RentalStrategyConfig)
+    management: ManagementConfig = field(default_factory=ManagementConfig)
+    location: LocationConfig = field(default_factory=LocationConfig)
+    investment: InvestmentConfig = field(default_factory=InvestmentConfig)
     
     # Price range (calculated dynamically)
     min_price: Optional[int] = None
@@ -120,11 +121,11 @@ class SearchConfig:
             params['min_price'] = self.min_price
         if self.max_price:
             params['max_price'] = self.max_price
-            
+        
         return params
     
-    def calculate_price_range(self, avg_rent: float) -> None:
-        """Calculate price range based on target ROI"""
+    def with_price_range(self, avg_rent: float) -> 'SearchConfig':
+        """Calculate price range based on target ROI, returning a new config"""
         # Apply management fees
         net_rent = avg_rent * (1 - self.management.management_fee_rate)
         
@@ -143,8 +144,11 @@ class SearchConfig:
             max_price = (annual_noi / target_roi_decimal) / down_payment_rate
         
         # Set price range with buffer
-        self.max_price = int(max_price * 0.85)  # 15% negotiation buffer
-        self.min_price = int(max_price * 0.4)   # Don't go too low-end
+        return replace(
+            self,
+            max_price=int(max_price * 0.85),  # 15% negotiation buffer
+            min_price=int(max_price * 0.4)    # Don't go too low-end
+        )
 
 # Preset configurations for different scenarios
 CASH_FLOW_CONFIG = SearchConfig(
@@ -172,17 +176,18 @@ SECTION_8_CONFIG = SearchConfig(
 # Environment variables for sensitive data
 ZILLOW_DELAY = float(os.getenv('ZILLOW_DELAY', '2.0'))  # Seconds between requests
 USER_AGENT = os.getenv('USER_AGENT', 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36')
+SELENIUM_REMOTE_URL = os.getenv('SELENIUM_REMOTE_URL')  # Selenium Grid hub, e.g. http://localhost:4444
 
 # Example usage
 if __name__ == "__main__":
     # Test configuration
-    config = SearchConfig()
-    config.location.county = "Mecklenburg"
-    config.location.state = "NC"
-    config.target_roi = 15.0
+    config = SearchConfig(
+        target_roi=15.0,
+        location=LocationConfig(county="Mecklenburg", state="NC")
+    )
     
     # Calculate price range (example with $1400 avg rent)
-    config.calculate_price_range(1400.0)
+    config = config.with_price_range(1400.0)
     
     print("Search Configuration:")
     print(f"Location: {config.location.county}, {config.location.state}")
@@ -0,0 +1,84 @@
+"""
+Tests for the Zillow scraper's HTTP search paths
+"""
+
+import httpx
+import pytest
+
+from automation import zillow_scraper
+from automation.zillow_scraper import ZillowWholesaleScraper
+
+def search_payload(*zpids):
+    """Search API response body listing the given zpids"""
+    return {
+        'cat1': {
+            'searchResults': {
+                'mapResults': [
+                    {
+                        'zpid': zpid,
+                        'address': f"{zpid} Main St, Raleigh, NC",
+                        'price': '$200,000',
+                        'beds': 3,
+                        'baths': 2,
+                        'area': 1500,
+                        'detailUrl': f"/homedetails/{zpid}_zpid/",
+                        'hdpData': {'homeInfo': {'daysOnZillow': 95}}
+                    }
+                    for zpid in zpids
+                ]
+            }
+        }
+    }
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    """Scraper whose HTTP clients talk to a mock Zillow"""
+    searched = []
+    
+    def handler(request):
+        if request.url.path.startswith('/async-create-search-page-state'):
+            # One stable listing per distinct search
+            search_state = request.url.params['searchQueryState']
+            searched.append(search_state)
+            zpid = str(1001 + list(dict.fromkeys(searched)).index(search_state))
+            return httpx.Response(200, json=search_payload(zpid))
+        return httpx.Response(200, text='<html>home</html>')
+    
+    monkeypatch.setitem(zillow_scraper.CLIENT_OPTIONS, 'transport', httpx.MockTransport(handler))
+    scraper = ZillowWholesaleScraper({
+        'location_type': 'zip',
+        'zip_code': '27601',
+        'property_types': {'single_family': True},
+        'cache_path': str(tmp_path / 'cache.feather'),
+        'http_cache_dir': str(tmp_path / 'zcache')
+    })
+    scraper.searched = searched
+    return scraper
+
+def test_search_properties_many_returns_every_location(scraper):
+    properties = scraper.search_properties_many(['27601', '27603', 'Durham-NC'])
+    
+    assert len(properties) == 3
+    assert len(scraper.searched) == 3
+    assert all(prop['days_on_market'] == '95' for prop in properties)
+
+def test_search_properties_parses_results(scraper):
+    properties = scraper.search_properties()
+    
+    assert [prop['address'] for prop in properties] == ['1001 Main St, Raleigh, NC']
+    assert properties[0]['url'] == 'https://www.zillow.com/homedetails/1001_zpid/'
+    scraper.cleanup()
+
+def test_cached_listings_stay_in_results(scraper, tmp_path):
+    scraper.search_properties()
+    scraper.save_cache()
+    scraper.cleanup()
+    
+    # Same search on a later run: the listing comes back from the cache
+    rerun = ZillowWholesaleScraper(scraper.config)
+    properties = rerun.search_properties()
+    
+    assert [prop['scraped_date'] for prop in properties] == [scraper.properties[0]['scraped_date']]
+    assert rerun.analyze_deals()
+    assert rerun.export_call_sheets(str(tmp_path / 'call_sheets.csv'))
+    rerun.cleanup()